@@ -0,0 +1,714 @@
+from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.middleware.cors import CORSMiddleware
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+import asyncio
+import uuid
+import os
+import re
+import logging
+import msgspec
+import orjson
+from dotenv import load_dotenv
+from bson import ObjectId 
+from pymongo.errors import DuplicateKeyError
+
+# -------------------------
+# EVENT LOOP
+# -------------------------
+# uvloop replaces the default asyncio loop for every loop created from here on,
+# including the one Mangum runs requests on. Not available on Windows.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# -------------------------
+# LOAD ENV VARIABLES
+# -------------------------
+load_dotenv()
+
+# Used when CORS_ORIGINS isn't set
+DEFAULT_CORS_ORIGINS = (
+    "http://localhost:3000",
+    "https://musicplayerfullstack.netlify.app/",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    Environment config, read once at import.
+    """
+    mongo_url: str
+    db_name: str
+    cors_origins: Tuple[str, ...]
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        mongo_url = os.environ.get("MONGO_URL")
+        db_name = os.environ.get("DB_NAME")
+        if not mongo_url or not db_name:
+            raise RuntimeError("Missing MONGO_URL or DB_NAME environment variables")
+        # Comma-separated; "a, b" is accepted and blank entries are ignored
+        cors_origins = tuple(
+            origin.strip() for origin in os.environ.get("CORS_ORIGINS", "").split(",") if origin.strip()
+        )
+        return cls(
+            mongo_url=mongo_url,
+            db_name=db_name,
+            cors_origins=cors_origins or DEFAULT_CORS_ORIGINS,
+        )
+
+
+settings = Settings.from_env()
+
+# -------------------------
+# DATABASE CONNECTION
+# -------------------------
+class MongoClientPool:
+    """
+    One AsyncIOMotorClient per running event loop.
+    Motor clients are bound to the loop they were created on. Mangum and uvicorn run every
+    request on one long-lived loop, so normally a single client serves (and multiplexes)
+    everything; a loop started separately (asyncio.run, a test loop) gets its own client.
+    Clients whose loop has since closed are closed and dropped on the next get().
+    """
+    def __init__(self, url, **options):
+        self._url = url
+        self._options = options
+        self._clients = {}
+
+    def get(self) -> AsyncIOMotorClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            for old_loop in [other for other in self._clients if other.is_closed()]:
+                self._clients.pop(old_loop).close()
+            client = AsyncIOMotorClient(self._url, io_loop=loop, **self._options)
+            self._clients[loop] = client
+        return client
+
+
+# tz_aware: stored dates come back as UTC-aware datetimes, so encoders emit the offset
+pool = MongoClientPool(
+    settings.mongo_url, maxPoolSize=100, minPoolSize=10, waitQueueTimeoutMS=2000, tz_aware=True
+)
+
+
+def get_db():
+    return pool.get()[settings.db_name]
+
+
+def id_candidates(api_id: str) -> list:
+    """
+    _id values an API id can refer to: the uuid _id of current docs, or the ObjectId _id of
+    docs written before ids were stored as _id (clients were given its hex string).
+    """
+    return [api_id, ObjectId(api_id)] if ObjectId.is_valid(api_id) else [api_id]
+
+
+def id_filter(api_id: str) -> dict:
+    return {"_id": {"$in": id_candidates(api_id)}}
+
+
+class BatchLoader:
+    """
+    Coalesce concurrent find-by-_id calls on one collection into a single $in query.
+    Lookups arriving within `window` seconds of the first pending one share the round-trip.
+    """
+    def __init__(self, collection, projection, window=0.002):
+        self._collection = collection
+        self._projection = projection
+        self._window = window
+        self._loop = None
+        self._pending = {}
+        # Strong refs to in-flight dispatch tasks; the loop itself only keeps weak ones
+        self._tasks = set()
+
+    async def load(self, key):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures are bound to their loop, so a batch never spans loops
+            self._loop = loop
+            self._pending = {}
+        if not self._pending:
+            batch = self._pending
+            task = loop.create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(lambda done: self._settle(batch, done))
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        return await future
+
+    def _close_batch(self, batch):
+        if self._pending is batch:
+            self._pending = {}
+
+    def _settle(self, batch, task):
+        # Runs however the task ends - including a cancel before its first step,
+        # when _dispatch never got to execute - so no waiter is left hanging
+        self._tasks.discard(task)
+        self._close_batch(batch)
+        for futures in batch.values():
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+
+    async def _dispatch(self, batch):
+        await asyncio.sleep(self._window)
+        self._close_batch(batch)
+        ids = [candidate for key in batch for candidate in id_candidates(key)]
+        try:
+            docs = await get_db()[self._collection].find(
+                {"_id": {"$in": ids}}, self._projection
+            ).to_list(len(ids))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        found = {doc["_id"]: doc for doc in docs}
+        for key, futures in batch.items():
+            doc = next((found[c] for c in id_candidates(key) if c in found), None)
+            for i, future in enumerate(futures):
+                if not future.done():
+                    # Each waiter gets its own dict since from_mongo renames keys in place
+                    future.set_result(doc if i == 0 or doc is None else dict(doc))
+
+# -------------------------
+# JSON RESPONSES
+# -------------------------
+def _encode_default(obj):
+    """
+    orjson/msgspec fallback for types they can't serialize natively (legacy ObjectId _ids).
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dump_json(content) -> bytes:
+    return orjson.dumps(content, default=_encode_default, option=orjson.OPT_NAIVE_UTC)
+
+
+# Encodes the msgspec read models; one shared instance reuses its internal buffer
+read_encoder = msgspec.json.Encoder(enc_hook=_encode_default)
+
+
+class APIResponse(ORJSONResponse):
+    """
+    Default response class: orjson, with the _encode_default fallback.
+    """
+    def render(self, content) -> bytes:
+        return dump_json(content)
+
+
+class PrebuiltJSONResponse(APIResponse):
+    """
+    JSON response whose body was already encoded (read_encoder / dump_json).
+    Skips FastAPI's jsonable_encoder + response_model validation pass.
+    """
+    def render(self, content) -> bytes:
+        return content
+
+# -------------------------
+# ROUTER (mounted by build_app)
+# -------------------------
+api_router = APIRouter()
+
+# -------------------------
+# LOGGING
+# -------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("firebase-fastapi")
+logger.info(f"Connected to MongoDB: {settings.db_name}")
+
+# -------------------------
+# INDEXES
+# -------------------------
+async def ensure_indexes():
+    """
+    Create the indexes the routes rely on. create_index is a no-op when the index already exists.
+    """
+    db = get_db()
+    indexes = [
+        # Songs/playlists are looked up by _id; favorites by song_id. Unique so a concurrent
+        # duplicate add fails with DuplicateKeyError (-> 400) instead of inserting twice
+        (db.favorites, [("song_id", 1)], {"unique": True}),
+        (db.songs, [("title", "text"), ("artist", "text"), ("album", "text")], {"name": "songs_text_idx"}),
+        # Lowercased word prefixes for the partial-word search. Songs written outside the API
+        # must carry search_words too: run backfill_search_words.py after importing or editing
+        (db.songs, [("search_words", 1)], {}),
+    ]
+    # One failing index (e.g. a text index already there under another name) must not
+    # keep the others from being created
+    for collection, keys, options in indexes:
+        try:
+            await collection.create_index(keys, **options)
+        except Exception as e:
+            logger.error(f"Error creating index {keys} on {collection.name}: {e}")
+
+# -------------------------
+# UTILITY: MongoDB -> JSON-safe dict
+# -------------------------
+# Fields a song doc is reported with, even if the stored doc lacks them
+SONG_DEFAULTS = {
+    "title": None, "artist": None, "album": None, "duration": None,
+    "cover_url": None, "audio_url": None, "created_at": None,
+}
+
+
+def mongo_to_dict(doc, defaults=SONG_DEFAULTS):
+    """
+    Convert MongoDB _id to string 'id' and ensure all fields exist to avoid validation errors.
+    Missing fields are filled by a single dict merge against `defaults`.
+    """
+    if not doc:
+        return None
+    doc = {**defaults, **doc}
+    if "_id" in doc:
+        doc["id"] = str(doc.pop("_id"))
+    return doc
+
+# -------------------------
+# UTILITY: read-side helpers
+# -------------------------
+def to_mongo(model) -> dict:
+    """
+    Dump a model for insert. The uuid id is stored as _id, and created_at stays a
+    datetime so Mongo stores a BSON Date.
+    """
+    doc = model.model_dump()
+    doc["_id"] = doc.pop("id")
+    return doc
+
+
+def from_mongo(model, doc):
+    """
+    Build a msgspec read model from a projected doc read from our own DB (no validation).
+    """
+    doc["id"] = doc.pop("_id")
+    return model(**doc)
+
+
+async def json_array_stream(docs, model):
+    """
+    Encode an async iterable of Mongo docs as a JSON array, one element per chunk,
+    so only the cursor's current batch is held in memory.
+    """
+    sep = b"["
+    async for doc in docs:
+        yield sep + read_encoder.encode(from_mongo(model, doc))
+        sep = b","
+    yield b"[]" if sep == b"[" else b"]"
+
+# -------------------------
+# MODELS
+# -------------------------
+def new_id() -> str:
+    return str(uuid.uuid4())
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Song(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: Optional[str] = Field(default_factory=new_id)
+    title: Optional[str] = None         # <-- FIX: made optional
+    artist: Optional[str] = None        # <-- FIX: made optional
+    album: Optional[str] = None
+    duration: Optional[int] = None      # <-- FIX: made optional
+    cover_url: Optional[str] = None     # <-- FIX: made optional
+    audio_url: Optional[str] = None     # <-- FIX: made optional
+    created_at: Optional[datetime] = Field(default_factory=utc_now)
+
+class SongCreate(BaseModel):
+    title: str
+    artist: str
+    album: str
+    duration: int
+    cover_url: str
+    audio_url: str
+
+class Playlist(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: Optional[str] = Field(default_factory=new_id)
+    name: Optional[str] = None
+    description: Optional[str] = ""
+    cover_url: Optional[str] = None
+    song_ids: List[str] = Field(default_factory=list)
+    created_at: Optional[datetime] = Field(default_factory=utc_now)
+
+class PlaylistCreate(BaseModel):
+    name: str
+    description: Optional[str] = ""
+    cover_url: str
+
+class PlaylistAddSong(BaseModel):
+    song_id: str
+
+class Favorite(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: Optional[str] = Field(default_factory=new_id)
+    song_id: Optional[str]
+    created_at: Optional[datetime] = Field(default_factory=utc_now)
+
+class FavoriteCreate(BaseModel):
+    song_id: str
+
+# -------------------------
+# READ MODELS: msgspec mirrors of the response models for the GET routes.
+# Pydantic stays on the POST routes for input validation and schema docs.
+# -------------------------
+class SongRead(msgspec.Struct):
+    id: str
+    title: Optional[str] = None
+    artist: Optional[str] = None
+    album: Optional[str] = None
+    duration: Optional[int] = None
+    cover_url: Optional[str] = None
+    audio_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class PlaylistRead(msgspec.Struct):
+    id: str
+    name: Optional[str] = None
+    description: Optional[str] = ""
+    cover_url: Optional[str] = None
+    song_ids: List[str] = msgspec.field(default_factory=list)
+    created_at: Optional[datetime] = None
+
+class FavoriteRead(msgspec.Struct):
+    id: str
+    song_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+# -------------------------
+# PROJECTIONS: only fetch the fields the response models expose
+# -------------------------
+SONG_PROJECTION = {
+    "_id": 1, "title": 1, "artist": 1, "album": 1,
+    "duration": 1, "cover_url": 1, "audio_url": 1, "created_at": 1,
+}
+PLAYLIST_PROJECTION = {
+    "_id": 1, "name": 1, "description": 1, "cover_url": 1, "song_ids": 1, "created_at": 1,
+}
+FAVORITE_PROJECTION = {"_id": 1, "song_id": 1, "created_at": 1}
+
+# Docs Motor pulls per getMore when streaming the song list
+SONG_BATCH_SIZE = 200
+
+# Point lookups by id, coalesced across concurrent requests
+song_loader = BatchLoader("songs", SONG_PROJECTION)
+playlist_loader = BatchLoader("playlists", PLAYLIST_PROJECTION)
+
+# -------------------------
+# ROUTES
+# -------------------------
+@api_router.get("/")
+async def root():
+    return {"message": "E1 Music API"}
+
+
+    # ---- SONGS TEST ----
+@api_router.get("/songs-test")
+async def songs_test():
+    db = get_db()
+    try:
+        songs = await db.songs.find({}).to_list(10)
+        # Use mongo_to_dict to safely convert _id to string
+        return [mongo_to_dict(song) for song in songs]
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# -------------------------
+# SONGS ROUTES initialization to Read Data 
+# -------------------------
+@api_router.get("/init-data")
+async def init_data():
+    return {"message": "ok"}
+
+
+
+
+
+def song_search_words(title, artist, album) -> list:
+    """
+    Lowercased words of title/artist/album, stored as search_words for prefix search.
+    The one tokenizer for both write paths: create_song and backfill_search_words.py.
+    """
+    text = " ".join(field for field in (title, artist, album) if field)
+    return text.lower().split()
+
+
+@lru_cache(maxsize=1024)
+def _build_search_query(search: str) -> dict:
+    """
+    Every search word must prefix one of the song's search_words ("beat" finds "The Beatles").
+    Patterns are escaped (no regex injection) and anchored on lowercased data, so the
+    search_words index can serve them as a range scan without a case-insensitive regex.
+    Cached for repeated autocomplete searches; callers must not mutate the result.
+    """
+    return {"$and": [{"search_words": re.compile("^" + re.escape(word))} for word in search.lower().split()]}
+
+
+async def _iter_songs(db, search):
+    search = (search or "").strip()
+    if not search:
+        async for song in db.songs.find({}, SONG_PROJECTION).limit(1000).batch_size(SONG_BATCH_SIZE):
+            yield song
+        return
+    seen = []
+    # Full-word matches are served by songs_text_idx, best match first
+    cursor = (
+        db.songs.find({"$text": {"$search": search}}, SONG_PROJECTION)
+        .sort([("score", {"$meta": "textScore"})])
+        .limit(1000)
+        .batch_size(SONG_BATCH_SIZE)
+    )
+    async for song in cursor:
+        seen.append(song["_id"])
+        yield song
+    remaining = 1000 - len(seen)
+    if remaining <= 0:
+        return
+    # Then word-prefix matches (partial words while typing) not already returned
+    query = {**_build_search_query(search), "_id": {"$nin": seen}}
+    async for song in db.songs.find(query, SONG_PROJECTION).limit(remaining).batch_size(SONG_BATCH_SIZE):
+        yield song
+
+
+@api_router.get("/songs")
+async def get_songs(search: Optional[str] = None):
+    db = get_db()
+    try:
+        chunks = json_array_stream(_iter_songs(db, search), SongRead)
+        # Pull the first chunk here so query errors still surface as a 500
+        first = await anext(chunks)
+    except Exception as e:
+        logger.error(f"Error fetching songs: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    async def body():
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+        #Response Get
+
+@api_router.get("/songs/{song_id}", response_class=PrebuiltJSONResponse)
+async def get_song(song_id: str):
+    try:
+        song = await song_loader.load(song_id)
+        if not song:
+            raise HTTPException(status_code=404, detail="Song not found")
+        return PrebuiltJSONResponse(read_encoder.encode(from_mongo(SongRead, song)))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching song {song_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+        #Create Songs
+
+@api_router.post("/songs", response_model=Song)
+async def create_song(input: SongCreate):
+    db = get_db()
+    try:
+        # SongCreate already validated the input; model_construct just fills id/created_at
+        song = Song.model_construct(**input.model_dump())
+        await db.songs.insert_one({**to_mongo(song), "search_words": song_search_words(song.title, song.artist, song.album)})
+        return song
+    except Exception as e:
+        logger.error(f"Error creating song: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+#
+# -------------------------
+# -------------------------
+# PLAYLISTS ROUTES
+# -------------------------
+@api_router.get("/playlists", response_class=PrebuiltJSONResponse)
+async def get_playlists():
+    db = get_db()
+    try:
+        playlists = await db.playlists.find({}, PLAYLIST_PROJECTION).to_list(1000)
+        return PrebuiltJSONResponse(read_encoder.encode([from_mongo(PlaylistRead, p) for p in playlists]))
+    except Exception as e:
+        logger.error(f"Error fetching playlists: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@api_router.get("/playlists/{playlist_id}", response_class=PrebuiltJSONResponse)
+async def get_playlist(playlist_id: str):
+    try:
+        playlist = await playlist_loader.load(playlist_id)
+        if not playlist:
+            raise HTTPException(status_code=404, detail="Playlist not found")
+        return PrebuiltJSONResponse(read_encoder.encode(from_mongo(PlaylistRead, playlist)))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching playlist {playlist_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@api_router.post("/playlists", response_model=Playlist)
+async def create_playlist(input: PlaylistCreate):
+    db = get_db()
+    try:
+        playlist = Playlist.model_construct(**input.model_dump())
+        await db.playlists.insert_one(to_mongo(playlist))
+        return playlist
+    except Exception as e:
+        logger.error(f"Error creating playlist: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Get songs in a playlist
+@api_router.get("/playlists/{playlist_id}/songs", response_class=PrebuiltJSONResponse)
+async def get_playlist_songs(playlist_id: str):
+    db = get_db()
+    # One round-trip: the playlist and its songs are joined server-side
+    result = await db.playlists.aggregate([
+        {"$match": id_filter(playlist_id)},
+        # Entries added before ids were uuids hold the song's ObjectId as a hex string;
+        # join on both forms ($convert yields null for uuids, which matches no _id)
+        {"$addFields": {"lookup_ids": {"$concatArrays": [
+            {"$ifNull": ["$song_ids", []]},
+            {"$map": {
+                "input": {"$ifNull": ["$song_ids", []]},
+                "in": {"$convert": {"input": "$$this", "to": "objectId", "onError": None, "onNull": None}},
+            }},
+        ]}}},
+        {"$lookup": {
+            "from": "songs",
+            "localField": "lookup_ids",
+            "foreignField": "_id",
+            "pipeline": [{"$project": SONG_PROJECTION}],
+            "as": "songs",
+        }},
+        {"$project": {"_id": 0, "songs": 1}},
+    ]).to_list(1)
+    if not result:
+        raise HTTPException(status_code=404, detail="Playlist not found")
+    songs = result[0]["songs"]
+    return PrebuiltJSONResponse(read_encoder.encode([from_mongo(SongRead, song) for song in songs]))
+
+# Add song to playlist
+@api_router.post("/playlists/{playlist_id}/songs")
+async def add_song_to_playlist(playlist_id: str, input: PlaylistAddSong):
+    db = get_db()
+    song = await song_loader.load(input.song_id)
+    if not song:
+        raise HTTPException(status_code=404, detail="Song not found")
+    # Existence check, dedup and update in a single op
+    result = await db.playlists.update_one(
+        {**id_filter(playlist_id), "song_ids": {"$ne": input.song_id}},
+        {"$addToSet": {"song_ids": input.song_id}},
+    )
+    if result.matched_count == 0:
+        # Only the failure path pays for a second lookup: missing playlist vs duplicate song
+        if await db.playlists.count_documents(id_filter(playlist_id), limit=1):
+            raise HTTPException(status_code=400, detail="Song already in playlist")
+        raise HTTPException(status_code=404, detail="Playlist not found")
+    return {"message": "Song added to playlist"}
+
+
+
+@api_router.delete("/playlists/{playlist_id}")
+async def delete_playlist(playlist_id: str):
+    db = get_db()
+    try:
+        result = await db.playlists.delete_one(id_filter(playlist_id))
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail="Playlist not found")
+        return {"message": "Playlist deleted"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting playlist {playlist_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+# FAVORITES ROUTES
+# -------------------------
+@api_router.get("/favorites", response_class=PrebuiltJSONResponse)
+async def get_favorites():
+    db = get_db()
+    try:
+        favorites = await db.favorites.find({}, FAVORITE_PROJECTION).to_list(1000)
+        return PrebuiltJSONResponse(read_encoder.encode([from_mongo(FavoriteRead, fav) for fav in favorites]))
+    except Exception as e:
+        logger.error(f"Error fetching favorites: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@api_router.post("/favorites", response_model=Favorite)
+async def add_favorite(input: FavoriteCreate):
+    db = get_db()
+    try:
+        existing = await db.favorites.find_one({"song_id": input.song_id}, {"_id": 1})
+        if existing:
+            raise HTTPException(status_code=400, detail="Song already favorited")
+        favorite = Favorite.model_construct(**input.model_dump())
+        await db.favorites.insert_one(to_mongo(favorite))
+        return favorite
+    except HTTPException:
+        raise
+    except DuplicateKeyError:
+        # The unique song_id index catches a concurrent add that slipped past the check above
+        raise HTTPException(status_code=400, detail="Song already favorited")
+    except Exception as e:
+        logger.error(f"Error adding favorite: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@api_router.delete("/favorites/{song_id}")
+async def remove_favorite(song_id: str):
+    db = get_db()
+    try:
+        result = await db.favorites.delete_one({"song_id": song_id})
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail="Favorite not found")
+        return {"message": "Removed from favorites"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error removing favorite {song_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+# -------------------------
+# FASTAPI APP
+# -------------------------
+def build_app(prefix: str = "") -> FastAPI:
+    """
+    Build the API app with every route mounted under `prefix`.
+    Entry points (main.py for Lambda/uvicorn) only pick the prefix.
+    """
+    app = FastAPI(title="E1 Music API", default_response_class=APIResponse)
+
+    # MIDDLEWARE
+    # -------------------------
+    # This FIXES the error:
+    # "No 'Access-Control-Allow-Origin' header is present"
+    # REQUIRED for localhost, Netlify, Firebase, Emergent, etc.
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=list(settings.cors_origins),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.add_event_handler("startup", ensure_indexes)
+    app.include_router(api_router, prefix=prefix)
+    return app
@@ -0,0 +1,37 @@
+"""
+One-off: (re)compute songs.search_words, the lowercased words the partial-word search
+in GET /songs matches on. create_song writes it for songs added through the API; run
+this after songs are inserted or edited any other way (imports, the Atlas UI, scripts).
+
+    python backfill_search_words.py          # songs missing search_words
+    python backfill_search_words.py --all    # every song, e.g. after bulk edits
+"""
+import asyncio
+import sys
+
+from pymongo import UpdateOne
+
+from app_core import get_db, song_search_words
+
+BATCH_SIZE = 500
+
+
+async def backfill(refresh_all: bool = False) -> int:
+    db = get_db()
+    query = {} if refresh_all else {"search_words": {"$exists": False}}
+    updated = 0
+    ops = []
+    async for doc in db.songs.find(query, {"title": 1, "artist": 1, "album": 1}):
+        words = song_search_words(doc.get("title"), doc.get("artist"), doc.get("album"))
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"search_words": words}}))
+        if len(ops) == BATCH_SIZE:
+            updated += (await db.songs.bulk_write(ops, ordered=False)).modified_count
+            ops = []
+    if ops:
+        updated += (await db.songs.bulk_write(ops, ordered=False)).modified_count
+    return updated
+
+
+if __name__ == "__main__":
+    count = asyncio.run(backfill(refresh_all="--all" in sys.argv[1:]))
+    print(f"Updated search_words on {count} songs")
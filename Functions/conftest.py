@@ -0,0 +1,5 @@
+import os
+
+# app_core reads its settings at import time
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test")
@@ -0,0 +1,57 @@
+import asyncio
+from types import SimpleNamespace
+
+import backfill_search_words
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeSongs:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+        self.updates = {}
+
+    def find(self, query, projection):
+        self.queries.append(query)
+        return FakeCursor(self.docs)
+
+    async def bulk_write(self, ops, ordered=True):
+        for op in ops:
+            self.updates[op._filter["_id"]] = op._doc["$set"]["search_words"]
+        return SimpleNamespace(modified_count=len(ops))
+
+
+def test_backfill_tokenizes_like_create_song(monkeypatch):
+    songs = FakeSongs([
+        {"_id": "a", "title": "Hey\tJude", "artist": "The  Beatles", "album": None},
+        {"_id": "b", "title": "Über Alles", "artist": "ÉDITH"},
+    ])
+    monkeypatch.setattr(backfill_search_words, "get_db", lambda: SimpleNamespace(songs=songs))
+
+    assert asyncio.run(backfill_search_words.backfill()) == 2
+    assert songs.queries == [{"search_words": {"$exists": False}}]
+    assert songs.updates == {
+        "a": ["hey", "jude", "the", "beatles"],
+        "b": ["über", "alles", "édith"],
+    }
+
+
+def test_backfill_all_refreshes_every_song(monkeypatch):
+    songs = FakeSongs([])
+    monkeypatch.setattr(backfill_search_words, "get_db", lambda: SimpleNamespace(songs=songs))
+
+    assert asyncio.run(backfill_search_words.backfill(refresh_all=True)) == 0
+    assert songs.queries == [{}]
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+import app_core
+from app_core import BatchLoader
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    async def to_list(self, length):
+        return self._docs[:length]
+
+
+class FakeCollection:
+    def __init__(self, docs, error=None):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.error = error
+        self.queries = []
+
+    def find(self, query, projection):
+        self.queries.append(query)
+        if self.error:
+            raise self.error
+        ids = query["_id"]["$in"]
+        return FakeCursor([dict(self.docs[i]) for i in ids if i in self.docs])
+
+
+@pytest.fixture
+def songs(monkeypatch):
+    collection = FakeCollection([{"_id": "a", "title": "A"}, {"_id": "b", "title": "B"}])
+    monkeypatch.setattr(app_core, "get_db", lambda: {"songs": collection})
+    return collection
+
+
+def test_concurrent_loads_share_one_find(songs):
+    loader = BatchLoader("songs", {})
+
+    async def run():
+        return await asyncio.gather(*(loader.load(key) for key in ["a", "b", "a", "missing"]))
+
+    a, b, a_again, missing = asyncio.run(run())
+    assert len(songs.queries) == 1
+    assert a == {"_id": "a", "title": "A"}
+    assert b == {"_id": "b", "title": "B"}
+    # Waiters on the same key get equal but separate dicts
+    assert a_again == a and a_again is not a
+    assert missing is None
+
+
+def test_sequential_loads_use_separate_batches(songs):
+    loader = BatchLoader("songs", {})
+
+    async def run():
+        first = await loader.load("a")
+        second = await loader.load("b")
+        return first, second
+
+    assert asyncio.run(run()) == ({"_id": "a", "title": "A"}, {"_id": "b", "title": "B"})
+    assert len(songs.queries) == 2
+
+
+def test_legacy_object_id_key_resolves(monkeypatch):
+    oid = ObjectId()
+    collection = FakeCollection([{"_id": oid, "title": "Old"}])
+    monkeypatch.setattr(app_core, "get_db", lambda: {"songs": collection})
+    loader = BatchLoader("songs", {})
+
+    assert asyncio.run(loader.load(str(oid))) == {"_id": oid, "title": "Old"}
+
+
+def test_query_error_reaches_every_waiter(monkeypatch):
+    collection = FakeCollection([], error=RuntimeError("boom"))
+    monkeypatch.setattr(app_core, "get_db", lambda: {"songs": collection})
+    loader = BatchLoader("songs", {})
+
+    async def run():
+        return await asyncio.gather(loader.load("a"), loader.load("b"), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+    assert len(collection.queries) == 1
+
+
+def test_cancelled_dispatch_cancels_waiters(songs):
+    loader = BatchLoader("songs", {}, window=10)
+
+    async def run():
+        waiters = [asyncio.ensure_future(loader.load(key)) for key in ["a", "b"]]
+        await asyncio.sleep(0)
+        for task in list(loader._tasks):
+            task.cancel()
+        return await asyncio.gather(*waiters, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+    assert songs.queries == []
+    assert not loader._tasks
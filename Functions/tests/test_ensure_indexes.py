@@ -0,0 +1,33 @@
+import asyncio
+from types import SimpleNamespace
+
+import app_core
+
+
+class FakeCollection:
+    def __init__(self, name, created, fail_on=None):
+        self.name = name
+        self._created = created
+        self._fail_on = fail_on
+
+    async def create_index(self, keys, **options):
+        if keys == self._fail_on:
+            raise RuntimeError("index conflict")
+        self._created.append((self.name, keys, options))
+
+
+def test_failing_index_does_not_skip_the_others(monkeypatch):
+    created = []
+    text_keys = [("title", "text"), ("artist", "text"), ("album", "text")]
+    db = SimpleNamespace(
+        songs=FakeCollection("songs", created, fail_on=text_keys),
+        favorites=FakeCollection("favorites", created),
+    )
+    monkeypatch.setattr(app_core, "get_db", lambda: db)
+
+    asyncio.run(app_core.ensure_indexes())
+
+    assert created == [
+        ("favorites", [("song_id", 1)], {"unique": True}),
+        ("songs", [("search_words", 1)], {}),
+    ]